@@ -6,31 +6,47 @@ For production use, consider using environment variables or a secure secrets man
 """
 
 import os
+from types import MappingProxyType
+
+# All settings are resolved once at import and frozen read-only so hot
+# loops can bind them to constants without risk of accidental mutation.
 
 # MongoDB Atlas Configuration
-MONGODB_CONFIG = {
+MONGODB_CONFIG = MappingProxyType({
     "public_key": os.getenv("MONGODB_PUBLIC_KEY", "your_mongodb_public_key_here"),
     "private_key": os.getenv("MONGODB_PRIVATE_KEY", "your_mongodb_private_key_here"), 
     "group_id": os.getenv("MONGODB_GROUP_ID", "your_mongodb_project_id_here"),
     "base_url": "https://cloud.mongodb.com/api/atlas/v2"
-}
+})
 
 # Azure Application Insights Configuration
-AZURE_CONFIG = {
+AZURE_CONFIG = MappingProxyType({
     "connection_string": os.getenv("AZURE_APPINSIGHTS_CONNECTION_STRING", "your_azure_application_insights_connection_string_here"),
-    "target_resource": os.getenv("AZURE_TARGET_RESOURCE", "your_target_app_insights_resource_name_here")
-}
+    "target_resource": os.getenv("AZURE_TARGET_RESOURCE", "your_target_app_insights_resource_name_here"),
+    # Optional Logs Ingestion API (DCR-based) bulk path; leave empty to
+    # send everything through Application Insights instead
+    "dce_endpoint": os.getenv("AZURE_DCE_ENDPOINT", ""),
+    "dcr_id": os.getenv("AZURE_DCR_ID", ""),
+    "dcr_stream": os.getenv("AZURE_DCR_STREAM", "Custom-MongoDBDF")
+})
 
 # API Headers for MongoDB Atlas v2 API
-API_HEADERS = {
+API_HEADERS = MappingProxyType({
     "Accept": "application/vnd.atlas.2025-03-12+json",
     "Accept-Gzip": "application/vnd.atlas.2025-03-12+gzip"
-}
+})
 
 # Throttling Configuration
-THROTTLING_CONFIG = {
-    "batch_size": 50,  # Process logs in batches
-    "batch_delay": 2.0,  # Delay between batches (seconds)
-    "log_delay": 0.01,  # Delay between individual log entries (seconds)
+THROTTLING_CONFIG = MappingProxyType({
+    "batch_delay": 2.0,  # Delay when the exporter queue is backed up (seconds)
+    "queue_high_watermark": 2000,  # Pause only when this many entries are pending export
+    "queue_max_size": 4096,  # Export queue capacity; keep > watermark + max_batch_size so a flush can't overflow it
+    "export_interval": 2.0,  # How often the Azure exporter flushes its batch (seconds)
+    "max_batch_size": 500,  # Max telemetry items per export request
     "telemetry_wait": 5.0  # Wait time for final telemetry to be sent (seconds)
-}
+})
+
+# Hot values bound once so consumers can import them directly instead
+# of doing a dict lookup per access
+AZURE_CONNECTION_STRING = AZURE_CONFIG["connection_string"]
+AZURE_TARGET_RESOURCE = AZURE_CONFIG["target_resource"]
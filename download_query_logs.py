@@ -1,40 +1,124 @@
 import requests
 import gzip
+import itertools
 import os
 import logging
 import json
 import time
-from opencensus.ext.azure.log_exporter import AzureLogHandler
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from email.utils import formatdate
+from typing import Optional
+from azure.monitor.opentelemetry.exporter import AzureMonitorLogExporter
+from opentelemetry._logs import set_logger_provider
+from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler, LogRecordProcessor
+from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
+from requests.adapters import HTTPAdapter, Retry
 from requests.auth import HTTPDigestAuth
 
+# orjson parses in C and accepts raw bytes; fall back to stdlib json
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+# Intel ISA-L's igzip does SIMD-accelerated DEFLATE, 2-4x faster than
+# zlib for decompression; same file API as stdlib gzip
+try:
+    from isal import igzip as gzip_mod
+except ImportError:
+    gzip_mod = gzip
+
+# azure-identity is only needed for the Logs Ingestion bulk path
+try:
+    from azure.identity import DefaultAzureCredential
+except ImportError:
+    DefaultAzureCredential = None
+
+# msgspec decodes straight into typed structs in C, beating even a
+# generic dict parse for this fixed schema; optional like the others
+try:
+    import msgspec
+
+    class _TPart(msgspec.Struct, rename={"date": "$date"}):
+        date: Optional[str] = None
+
+    class _MongoLog(msgspec.Struct):
+        t: Optional[_TPart] = None
+        s: str = "I"
+        c: Optional[str] = None
+        ctx: Optional[str] = None
+        msg: str = "MongoDB Data Federation Log"
+        attr: Optional[dict] = None
+
+    _MONGO_LOG_DECODER = msgspec.json.Decoder(_MongoLog)
+except ImportError:
+    _MONGO_LOG_DECODER = None
+
 # Import configuration
 try:
-    from config import MONGODB_CONFIG, AZURE_CONFIG, THROTTLING_CONFIG
+    from config import (MONGODB_CONFIG, AZURE_CONFIG, THROTTLING_CONFIG, API_HEADERS,
+                        AZURE_CONNECTION_STRING, AZURE_TARGET_RESOURCE)
 except ImportError:
     print("Error: config.py file not found. Please create it using the template.")
     print("Copy config.py.template to config.py and fill in your credentials.")
     exit(1)
 
-# Custom Azure Log Handler to filter out unwanted custom dimensions
-class FilteredAzureLogHandler(AzureLogHandler):
-    def emit(self, record):
-        # Filter out unwanted fields from custom dimensions if they exist
-        if hasattr(record, 'custom_dimensions') and record.custom_dimensions:
-            filtered_dimensions = {}
-            for key, value in record.custom_dimensions.items():
-                # Only keep the fields we want
-                if key not in ['fileName', 'module', 'lineNumber', 'process']:
-                    filtered_dimensions[key] = value
-            record.custom_dimensions = filtered_dimensions
-        super().emit(record)
-
-# Setup Azure Application Insights logger
+# Shared session for all Atlas API calls - reuses TCP/TLS connections
+# instead of paying the handshake cost on every request. A single
+# HTTPDigestAuth instance also caches the server's challenge, so only
+# the first call in a run pays the 401 round trip.
+SESSION = requests.Session()
+SESSION.auth = HTTPDigestAuth(MONGODB_CONFIG["public_key"], MONGODB_CONFIG["private_key"])
+SESSION.headers.update(API_HEADERS)
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Code-location attributes the logging bridge attaches to every record;
+# we don't want them in customDimensions (old and new semconv names)
+_DROP_DIMENSIONS = (
+    'code.filepath', 'code.function', 'code.lineno',
+    'code.file.path', 'code.function.name', 'code.line.number'
+)
+
+class DimensionFilterProcessor(LogRecordProcessor):
+    def on_emit(self, log_data):
+        # Drop unwanted attributes in place - no copy or reallocation per record
+        attributes = log_data.log_record.attributes
+        if attributes:
+            for key in _DROP_DIMENSIONS:
+                attributes.pop(key, None)
+
+    # SDKs before 1.27 named the processor hook "emit"
+    emit = on_emit
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis=30000):
+        return True
+
+# Setup Azure Application Insights logger via the OpenTelemetry exporter.
+# The batch processor batches records into export requests itself.
+azure_exporter = AzureMonitorLogExporter(connection_string=AZURE_CONNECTION_STRING)
+batch_processor = BatchLogRecordProcessor(
+    azure_exporter,
+    max_queue_size=THROTTLING_CONFIG["queue_max_size"],
+    max_export_batch_size=THROTTLING_CONFIG["max_batch_size"],
+    schedule_delay_millis=int(THROTTLING_CONFIG["export_interval"] * 1000)
+)
+logger_provider = LoggerProvider()
+logger_provider.add_log_record_processor(DimensionFilterProcessor())
+logger_provider.add_log_record_processor(batch_processor)
+set_logger_provider(logger_provider)
+
 logger = logging.getLogger("mongodb_atlas_logs")
 logger.setLevel(logging.INFO)
-azure_handler = FilteredAzureLogHandler(connection_string=AZURE_CONFIG["connection_string"])
-
-# Configure the Azure handler to prevent queue overflow
-azure_handler.setLevel(logging.INFO)
+azure_handler = LoggingHandler(level=logging.INFO, logger_provider=logger_provider)
 logger.addHandler(azure_handler)
 
 # Console logger for debugging
@@ -44,10 +128,147 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 
+# Constant dimensions shared by every forwarded line
+_BASE_DIMS = {
+    "source": "MongoDB Data Federation",
+    "log_type": "MongoDBDF",
+    "target_resource": AZURE_TARGET_RESOURCE
+}
+
 # Throttling configuration
-BATCH_SIZE = THROTTLING_CONFIG["batch_size"]  # Process in smaller batches
-BATCH_DELAY = THROTTLING_CONFIG["batch_delay"]  # Delay between batches (seconds)
-LOG_DELAY = THROTTLING_CONFIG["log_delay"]  # Small delay between individual log entries (seconds)
+BATCH_DELAY = THROTTLING_CONFIG["batch_delay"]  # Delay when the exporter queue is backed up (seconds)
+QUEUE_HIGH_WATERMARK = THROTTLING_CONFIG["queue_high_watermark"]  # Pending-export entries before pausing
+
+# MongoDB severity code -> logging level, precomputed so record dispatch
+# is one dict get instead of a per-record list build and membership scan
+_SEVERITY_LEVELS = {"F": logging.ERROR, "E": logging.ERROR, "W": logging.WARNING}
+
+class BatchingForwarder:
+    """
+    Buffers parsed log records and hands them to the Azure handler in
+    batches, skipping the per-call logging-framework overhead (record
+    construction helpers, filter chain, handler lookup) for bulk lines.
+    Operational messages still go through the regular logger.
+    """
+    def __init__(self, handler, flush_every=THROTTLING_CONFIG["max_batch_size"]):
+        self.handler = handler
+        self.flush_every = flush_every
+        self.buf = []
+
+    def add(self, severity, msg, dims):
+        self.buf.append((severity, msg, dims))
+        if len(self.buf) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.buf:
+            return
+        # Never dump a batch into a queue that's already past the
+        # watermark - a full flush could overflow it and drop records
+        if azure_queue_depth() > QUEUE_HIGH_WATERMARK:
+            logger.info("Exporter queue above watermark; pausing to let it drain...")
+            while azure_queue_depth() > QUEUE_HIGH_WATERMARK:
+                time.sleep(BATCH_DELAY)
+        handler = self.handler
+        level_for = _SEVERITY_LEVELS.get
+        for severity, msg, dims in self.buf:
+            level = level_for(severity, logging.INFO)
+            record = logging.LogRecord("mongodb_atlas_logs", level, __file__, 0, msg, None, None)
+            record.__dict__.update(dims)
+            handler.emit(record)
+        self.buf.clear()
+
+class LogsIngestionForwarder:
+    """
+    Bulk path: POSTs JSON arrays of records straight to the Azure
+    Monitor Logs Ingestion API (DCR-based) instead of one telemetry
+    envelope per line. Far fewer HTTP calls at sustained throughput;
+    the Application Insights handler keeps carrying operational
+    messages. Requires dce_endpoint/dcr_id in AZURE_CONFIG and the
+    azure-identity package.
+    """
+    MAX_BATCH_RECORDS = 1000
+    MAX_BATCH_BYTES = 800 * 1024  # stay safely under the 1 MB request limit
+
+    def __init__(self):
+        self.url = (
+            f"{AZURE_CONFIG['dce_endpoint'].rstrip('/')}/dataCollectionRules/"
+            f"{AZURE_CONFIG['dcr_id']}/streams/{AZURE_CONFIG['dcr_stream']}"
+            "?api-version=2023-01-01"
+        )
+        self.credential = DefaultAzureCredential()
+        # The ingestion endpoint throttles with 429 + Retry-After at
+        # sustained throughput; retry with backoff (urllib3 honors
+        # Retry-After) instead of losing the batch
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            max_retries=Retry(total=5, backoff_factor=1.0,
+                              status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=frozenset({'POST'}))
+        ))
+        self.buf = []
+        self.buf_bytes = 0
+        self._token = None
+        self._token_expires = 0
+
+    def _bearer_token(self):
+        # Refresh the cached token a few minutes before it expires
+        if self._token is None or time.time() >= self._token_expires - 300:
+            token = self.credential.get_token("https://monitor.azure.com/.default")
+            self._token = token.token
+            self._token_expires = token.expires_on
+        return self._token
+
+    def add(self, severity, msg, dims):
+        record = json.dumps({"Message": msg, **dims})
+        self.buf.append(record)
+        self.buf_bytes += len(record) + 1
+        if len(self.buf) >= self.MAX_BATCH_RECORDS or self.buf_bytes >= self.MAX_BATCH_BYTES:
+            self.flush()
+
+    def flush(self):
+        if not self.buf:
+            return
+        body = "[" + ",".join(self.buf) + "]"
+        try:
+            resp = self.session.post(
+                self.url,
+                data=body.encode('utf-8'),
+                headers={
+                    "Authorization": f"Bearer {self._bearer_token()}",
+                    "Content-Type": "application/json"
+                },
+                timeout=60
+            )
+        except requests.RequestException as e:
+            logger.error("Logs Ingestion API batch failed after retries, dropping %d records: %s", len(self.buf), e)
+        else:
+            if resp.status_code >= 400:
+                logger.error("Logs Ingestion API rejected a batch of %d records: %s - %s", len(self.buf), resp.status_code, resp.text)
+        self.buf.clear()
+        self.buf_bytes = 0
+
+def make_forwarder():
+    """
+    Pick the bulk Logs Ingestion path when it's configured and
+    azure-identity is installed, else the Application Insights handler.
+    """
+    if AZURE_CONFIG["dce_endpoint"] and AZURE_CONFIG["dcr_id"] and DefaultAzureCredential is not None:
+        return LogsIngestionForwarder()
+    return BatchingForwarder(azure_handler)
+
+def azure_queue_depth():
+    """
+    Number of log records waiting in the batch processor's export queue.
+    """
+    queue = getattr(batch_processor, '_queue', None)
+    if queue is None:
+        # Newer SDKs nest the queue inside a shared batch implementation
+        queue = getattr(getattr(batch_processor, '_batch_processor', None), '_queue', None)
+    try:
+        return len(queue)
+    except TypeError:
+        return 0
 
 def validate_azure_connection():
     """
@@ -56,28 +277,22 @@ def validate_azure_connection():
     try:
         # Send a test log to verify connection
         test_logger = logging.getLogger("connection_test_df")
-        test_handler = FilteredAzureLogHandler(connection_string=AZURE_CONFIG["connection_string"])
-        test_logger.addHandler(test_handler)
+        test_logger.addHandler(azure_handler)
         test_logger.setLevel(logging.INFO)
-        
+
         logger.info("=== Azure Application Insights Configuration (Data Federation) ===")
-        logger.info(f"Target Resource: {AZURE_CONFIG.get('target_resource', 'Not specified')}")
+        logger.info("Target Resource: %s", AZURE_TARGET_RESOURCE)
         logger.info("✓ Ready to send Data Federation logs to Application Insights")
-        
+
         # Send a test log
-        test_logger.info("Connection test from MongoDB Data Federation log forwarder", 
-                        extra={"custom_dimensions": {
-                            "test": True,
-                            "source": "MongoDB Data Federation",
-                            "log_type": "MongoDBDF",
-                            "target_resource": AZURE_CONFIG.get('target_resource', 'Not specified')
-                        }})
+        test_logger.info("Connection test from MongoDB Data Federation log forwarder",
+                        extra={"test": True, **_BASE_DIMS})
         
         logger.info("✓ Test log sent to Application Insights")
         return True
         
     except Exception as e:
-        logger.error(f"✗ Failed to validate Azure Application Insights connection: {str(e)}")
+        logger.error("✗ Failed to validate Azure Application Insights connection: %s", e)
         return False
 
 def test_mongodb_api_basic_access(group_id, public_key, private_key):
@@ -88,12 +303,12 @@ def test_mongodb_api_basic_access(group_id, public_key, private_key):
     logger.info("Testing basic MongoDB Atlas API access...")
     
     try:
-        resp = requests.get(url, auth=(public_key, private_key), timeout=30)
+        resp = SESSION.get(url, timeout=30)
         
         if resp.status_code == 200:
             project_info = resp.json()
-            logger.info(f"✓ MongoDB Atlas API access successful")
-            logger.info(f"✓ Project Name: {project_info.get('name', 'Unknown')}")
+            logger.info("✓ MongoDB Atlas API access successful")
+            logger.info("✓ Project Name: %s", project_info.get('name', 'Unknown'))
             return True
         elif resp.status_code == 401:
             logger.error("✗ MongoDB Atlas API authentication failed (401 Unauthorized)")
@@ -104,12 +319,12 @@ def test_mongodb_api_basic_access(group_id, public_key, private_key):
             logger.error("  Your API key may not have sufficient permissions")
             return False
         else:
-            logger.error(f"✗ MongoDB Atlas API returned status code: {resp.status_code}")
-            logger.error(f"  Response: {resp.text}")
+            logger.error("✗ MongoDB Atlas API returned status code: %s", resp.status_code)
+            logger.error("  Response: %s", resp.text)
             return False
             
     except Exception as e:
-        logger.error(f"✗ Failed to connect to MongoDB Atlas API: {str(e)}")
+        logger.error("✗ Failed to connect to MongoDB Atlas API: %s", e)
         return False
 
 def list_data_federation_instances(group_id, public_key, private_key):
@@ -123,7 +338,7 @@ def list_data_federation_instances(group_id, public_key, private_key):
     logger.info("Fetching available Data Federation instances using v2 API...")
     
     try:
-        resp = requests.get(url, auth=(public_key, private_key), headers=headers, timeout=30)
+        resp = SESSION.get(url, headers=headers, timeout=30)
         
         if resp.status_code == 200:
             # v2 API returns a results object
@@ -131,11 +346,11 @@ def list_data_federation_instances(group_id, public_key, private_key):
             instances = data.get('results', [])
             
             if instances:
-                logger.info(f"✓ Found {len(instances)} Data Federation instances:")
+                logger.info("✓ Found %d Data Federation instances:", len(instances))
                 for instance in instances:
                     name = instance.get('name', 'Unknown')
                     state = instance.get('state', 'Unknown')
-                    logger.info(f"  - Name: {name}, State: {state}")
+                    logger.info("  - Name: %s, State: %s", name, state)
                 return [instance.get('name') for instance in instances if instance.get('name')]
             else:
                 logger.warning("✗ No Data Federation instances found in this project")
@@ -151,115 +366,286 @@ def list_data_federation_instances(group_id, public_key, private_key):
             logger.error("  Required permission: Project Data Access Read/Write")
             return []
         else:
-            logger.error(f"✗ Failed to list Data Federation instances: {resp.status_code}")
-            logger.error(f"  Response: {resp.text}")
+            logger.error("✗ Failed to list Data Federation instances: %s", resp.status_code)
+            logger.error("  Response: %s", resp.text)
             return []
             
     except Exception as e:
-        logger.error(f"✗ Exception when listing Data Federation instances: {str(e)}")
+        logger.error("✗ Exception when listing Data Federation instances: %s", e)
         return []
 
-def download_data_federation_query_logs(group_id, data_federation_name, public_key, private_key, out_dir="mongodb_logs"):
+class _TeeStream:
     """
-    Download Data Federation query logs for a given instance using Digest Authentication
+    File-like wrapper that copies everything read from the response
+    stream into a local cache file, promoted into place (with its ETag
+    sidecar) once the stream is fully consumed. Gives re-runs a prior
+    copy to send conditional GET headers from without a separate
+    download pass; an aborted stream leaves only a .part file behind.
+    """
+    def __init__(self, raw, out_path, etag_path, etag=None):
+        self.raw = raw
+        self.out_path = out_path
+        self.etag_path = etag_path
+        self.etag = etag
+        self.part_path = out_path + '.part'
+        self.cache = open(self.part_path, 'wb', buffering=1 << 20)
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        if data:
+            self.cache.write(data)
+        elif not self.cache.closed:
+            # End of stream: the cache is complete, promote it
+            self.cache.close()
+            os.replace(self.part_path, self.out_path)
+            if self.etag:
+                with open(self.etag_path, 'w') as ef:
+                    ef.write(self.etag)
+        return data
+
+def download_data_federation_query_logs(group_id, data_federation_name, public_key, private_key, out_dir="mongodb_logs", stream_process=False):
+    """
+    Download Data Federation query logs for a given instance using Digest Authentication.
+    With stream_process=True the raw (still-compressed) response stream is returned
+    for in-flight processing instead of writing a .gz file to disk first.
     """
     url = f"https://cloud.mongodb.com/api/atlas/v2/groups/{group_id}/dataFederation/{data_federation_name}/queryLogs.gz"
     headers = {
         'Accept': 'application/vnd.atlas.2025-03-12+gzip'
     }
-    logger.info(f"Downloading query logs from Data Federation: {data_federation_name}")
+    logger.info("Downloading query logs from Data Federation: %s", data_federation_name)
     try:
-        os.makedirs(out_dir, exist_ok=True)
+        _ensure_dir(out_dir)
         out_path = os.path.join(out_dir, f"{data_federation_name}_queryLogs.gz")
-        resp = requests.get(url, auth=HTTPDigestAuth(public_key, private_key), headers=headers, stream=True, timeout=600)
+        etag_path = out_path + ".etag"
+        # Conditional GET: when a prior copy exists, let the server skip
+        # the transfer entirely if the logs haven't changed
+        if os.path.exists(out_path):
+            headers['If-Modified-Since'] = formatdate(os.path.getmtime(out_path), usegmt=True)
+            if os.path.exists(etag_path):
+                with open(etag_path) as ef:
+                    headers['If-None-Match'] = ef.read().strip()
+        resp = SESSION.get(url, headers=headers, stream=True, timeout=600)
+        if resp.status_code == 304:
+            logger.info("✓ Query logs unchanged since last run; reusing %s", out_path)
+            if stream_process:
+                return open(out_path, 'rb')
+            return out_path
         if resp.status_code == 200:
-            with open(out_path, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=8192):
+            if stream_process:
+                # We decompress ourselves, so keep urllib3 from decoding the body
+                resp.raw.decode_content = False
+                logger.info("✓ Streaming DF query logs directly from the response")
+                # Tee into the local cache so the next run can send a
+                # conditional GET even without a disk-download pass
+                return _TeeStream(resp.raw, out_path, etag_path, resp.headers.get('ETag'))
+            # 1 MiB chunks: far fewer loop iterations and syscalls per byte
+            # than the 8 KiB default, with file buffering sized to match
+            size = 0
+            with open(out_path, "wb", buffering=1 << 20) as f:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
                     f.write(chunk)
-            logger.info(f"✓ Downloaded DF query logs to {out_path} ({os.path.getsize(out_path)} bytes)")
+                    size += len(chunk)
+            etag = resp.headers.get('ETag')
+            if etag:
+                with open(etag_path, 'w') as ef:
+                    ef.write(etag)
+            logger.info("✓ Downloaded DF query logs to %s (%d bytes)", out_path, size)
             return out_path
         elif resp.status_code == 404:
-            logger.warning(f"No query logs found for {data_federation_name}.")
+            logger.warning("No query logs found for %s.", data_federation_name)
         else:
-            logger.error(f"Failed to download DF logs: {resp.status_code} - {resp.text}")
+            logger.error("Failed to download DF logs: %s - %s", resp.status_code, resp.text)
     except Exception as e:
-        logger.error(f"Exception downloading DF logs: {e}")
+        logger.error("Exception downloading DF logs: %s", e)
     return None
 
+# Directories already created this run, so repeat downloads skip the
+# makedirs/stat syscalls
+_DIRS = set()
+
+def _ensure_dir(d):
+    if d not in _DIRS:
+        os.makedirs(d, exist_ok=True)
+        _DIRS.add(d)
+
+# Lines handed to each parser worker at a time
+PARSE_CHUNK_LINES = 5000
+
+def _parse_chunk(lines):
+    """
+    Parse a chunk of raw log lines into (severity, message,
+    custom_dimensions) tuples. Runs in a worker process, so it must not
+    touch the logger or the Azure handler - parse errors are returned
+    for the parent to report.
+    """
+    parsed = []
+    errors = []
+    if _MONGO_LOG_DECODER is not None:
+        decode = _MONGO_LOG_DECODER.decode
+        for line in lines:
+            # Parsers tolerate the trailing newline; skip empties without
+            # allocating a stripped copy of every line
+            if not line or line == b'\n':
+                continue
+            try:
+                rec = decode(line)
+                severity = rec.s
+                custom_dimensions = {**_BASE_DIMS, "severity": severity}
+                if rec.t is not None and rec.t.date is not None:
+                    custom_dimensions["mongodb_timestamp"] = rec.t.date
+                if rec.c is not None:
+                    custom_dimensions["component"] = rec.c
+                if rec.ctx is not None:
+                    custom_dimensions["context"] = rec.ctx
+                if rec.attr:
+                    custom_dimensions["attributes"] = json.dumps(rec.attr)
+                parsed.append((severity, rec.msg, custom_dimensions))
+            except Exception as e:
+                errors.append((str(e), line[:500].decode('utf-8', errors='replace')))
+        return parsed, errors
+    for line in lines:
+        if not line or line == b'\n':
+            continue
+        try:
+            log_entry = loads(line)
+
+            # Use the actual MongoDB message as the main log message
+            mongodb_message = log_entry.get("msg", "MongoDB Data Federation Log")
+
+            # OpenTelemetry attributes must be non-None primitives, so
+            # skip absent fields and serialize attr to a JSON string.
+            # Avoid allocating a throwaway {} per line when "t" is absent.
+            severity = log_entry.get("s", "I")
+            custom_dimensions = {**_BASE_DIMS, "severity": severity}
+            t = log_entry.get("t")
+            if t:
+                timestamp = t.get("$date")
+                if timestamp is not None:
+                    custom_dimensions["mongodb_timestamp"] = timestamp
+            component = log_entry.get("c")
+            if component is not None:
+                custom_dimensions["component"] = component
+            context = log_entry.get("ctx")
+            if context is not None:
+                custom_dimensions["context"] = context
+            attr = log_entry.get("attr")
+            if attr:
+                custom_dimensions["attributes"] = json.dumps(attr)
+            parsed.append((severity, mongodb_message, custom_dimensions))
+        except Exception as e:
+            errors.append((str(e), line[:500].decode('utf-8', errors='replace')))
+    return parsed, errors
+
+def _chunked_lines(f, size=PARSE_CHUNK_LINES):
+    while True:
+        chunk = list(itertools.islice(f, size))
+        if not chunk:
+            return
+        yield chunk
+
+def forward_log_lines(f):
+    """
+    Forward MongoDB log lines (raw bytes) to Application Insights.
+    JSON parsing and dimension building are sharded across worker
+    processes; only this (parent) process talks to the Azure handler.
+    Returns (processed_count, error_count).
+    """
+    processed_count = 0
+    error_count = 0
+    forwarder = make_forwarder()
+
+    def handle_result(future):
+        nonlocal processed_count, error_count
+        parsed, errors = future.result()
+        # Backpressure lives in the forwarder's flush, which pauses
+        # whenever the export queue is past the watermark
+        for severity, mongodb_message, custom_dimensions in parsed:
+            forwarder.add(severity, mongodb_message, custom_dimensions)
+            processed_count += 1
+        for error, snippet in errors:
+            error_count += 1
+            logger.error("Failed to parse MongoDBDF log line", extra={"error": error, "line": snippet})
+
+    # Keep a bounded window of chunks in flight so the whole file is
+    # never read into memory at once
+    max_in_flight = (os.cpu_count() or 1) + 2
+    in_flight = deque()
+    with ProcessPoolExecutor() as pool:
+        for chunk in _chunked_lines(f):
+            in_flight.append(pool.submit(_parse_chunk, chunk))
+            if len(in_flight) >= max_in_flight:
+                handle_result(in_flight.popleft())
+        while in_flight:
+            handle_result(in_flight.popleft())
+    forwarder.flush()
+    logger.info("Log processing completed. Processed: %d, Errors: %d", processed_count, error_count)
+    logger.info("Waiting for final telemetry to be sent...")
+    time.sleep(5)
+    return processed_count, error_count
+
 def process_mongodb_logs(gzip_file_path):
     """
-    (No change) Process and forward logs to Application Insights, as in your code.
+    Process and forward logs from a downloaded .gz file to Application Insights.
     """
     try:
-        with gzip.open(gzip_file_path, 'rt', encoding='utf-8') as f:
-            processed_count = 0
-            error_count = 0
-            batch_count = 0
-            for idx, line in enumerate(f):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    log_entry = json.loads(line)
-                    
-                    # Use the actual MongoDB message as the main log message
-                    mongodb_message = log_entry.get("msg", "MongoDB Data Federation Log")
-                    
-                    custom_dimensions = {
-                        "mongodb_timestamp": log_entry.get("t", {}).get("$date"),
-                        "severity": log_entry.get("s"),
-                        "component": log_entry.get("c"),
-                        "context": log_entry.get("ctx"),
-                        "attributes": log_entry.get("attr", {}),
-                        "source": "MongoDB Data Federation",
-                        "log_type": "MongoDBDF",
-                        "target_resource": AZURE_CONFIG.get('target_resource', 'Not specified')
-                    }
-                    severity = log_entry.get("s", "I")
-                    if severity in ["F", "E"]:
-                        logger.error(mongodb_message, extra={"custom_dimensions": custom_dimensions})
-                    elif severity == "W":
-                        logger.warning(mongodb_message, extra={"custom_dimensions": custom_dimensions})
-                    else:
-                        logger.info(mongodb_message, extra={"custom_dimensions": custom_dimensions})
-                    processed_count += 1
-                    time.sleep(LOG_DELAY)
-                    if processed_count % BATCH_SIZE == 0:
-                        batch_count += 1
-                        logger.info(f"Processed batch {batch_count} ({processed_count} total entries). Pausing to prevent queue overflow...")
-                        time.sleep(BATCH_DELAY)
-                except Exception as e:
-                    error_count += 1
-                    logger.error("Failed to parse MongoDBDF log line", extra={"custom_dimensions": {"error": str(e), "line": line[:500]}})
-            logger.info(f"Log processing completed. Processed: {processed_count}, Errors: {error_count}")
-            logger.info("Waiting for final telemetry to be sent...")
-            time.sleep(5)
+        with gzip_mod.open(gzip_file_path, 'rb') as f:
+            forward_log_lines(f)
     except Exception as e:
-        logger.error(f"Failed to process DF gzipped log file: {str(e)}")
+        logger.error("Failed to process DF gzipped log file: %s", e)
+
+def process_mongodb_logs_stream(raw_stream):
+    """
+    Decompress and forward logs directly from the HTTP response stream,
+    overlapping network receive with parsing. Exceptions propagate so the
+    caller can retry via the download-to-disk path.
+    """
+    with gzip_mod.open(raw_stream, 'rb') as f:
+        forward_log_lines(f)
 
 def main_data_federation_log_forward(group_id, df_instance_name, public_key, private_key):
-    # Validate Azure connection first
-    if not validate_azure_connection():
-        logger.error("Azure Application Insights validation failed. Please check your connection string.")
-        return
-    
+    # The Azure validation and the Atlas API probe are independent, so
+    # run them concurrently and overlap their round trips
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        azure_future = executor.submit(validate_azure_connection)
+        mongodb_future = executor.submit(test_mongodb_api_basic_access, group_id, public_key, private_key)
+        if not azure_future.result():
+            logger.error("Azure Application Insights validation failed. Please check your connection string.")
+            return
+        if not mongodb_future.result():
+            logger.error("MongoDB Atlas API validation failed. Please check your API credentials.")
+            return
+
     # Skip listing instances since we know FederatedDatabaseInstance0 exists from Postman
     logger.info("Skipping instance listing, proceeding directly to download as Postman works...")
-    logger.info(f"Attempting to download logs for: {df_instance_name}")
+    logger.info("Attempting to download logs for: %s", df_instance_name)
     
-    # Download DF query logs directly
-    downloaded_logfile = download_data_federation_query_logs(group_id, df_instance_name, public_key, private_key)
-    if downloaded_logfile:
-        process_mongodb_logs(downloaded_logfile)
+    # Stream DF query logs straight from the response; fall back to
+    # download-to-disk if the stream drops mid-transfer
+    forwarded = False
+    log_stream = download_data_federation_query_logs(group_id, df_instance_name, public_key, private_key, stream_process=True)
+    if log_stream is not None:
+        try:
+            process_mongodb_logs_stream(log_stream)
+            forwarded = True
+        except Exception as e:
+            logger.error("Streaming log processing failed: %s. Retrying via download to disk...", e)
+    if not forwarded:
+        downloaded_logfile = download_data_federation_query_logs(group_id, df_instance_name, public_key, private_key)
+        if downloaded_logfile:
+            process_mongodb_logs(downloaded_logfile)
+            forwarded = True
+    if forwarded:
         logger.info("=== Data Federation Log Forwarding Summary ===")
         logger.info("All Data Federation logs have been forwarded to Azure Application Insights")
-        logger.info(f"Target Resource: {AZURE_CONFIG.get('target_resource', 'Not specified')}")
+        logger.info("Target Resource: %s", AZURE_TARGET_RESOURCE)
         logger.info("Use this query in Application Insights:")
         logger.info('traces | where customDimensions.source == "MongoDB Data Federation" | order by timestamp desc')
     else:
         logger.error("No Data Federation logs downloaded.")
     
     logging.shutdown()  # Ensure all logs are flushed
+    logger_provider.shutdown()  # Flush and stop the batch exporter
 
 # -- USAGE EXAMPLE --
 if __name__ == "__main__":